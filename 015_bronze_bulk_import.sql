@@ -0,0 +1,144 @@
+-- ============================================================================
+-- Bronze bulk import RPCs
+-- ============================================================================
+--
+-- Server-side helpers for import_bronze.py, kept out of 011 so they can be
+-- applied to databases where the bronze tables already exist. Every
+-- statement is re-runnable (CREATE OR REPLACE / REVOKE / GRANT).
+--
+-- Requires 011_bronze_call_reports.sql.
+-- ============================================================================
+
+
+-- ---------------------------------------------------------------------------
+-- Dynamic schema helpers
+-- ---------------------------------------------------------------------------
+
+-- Adds many TEXT columns to a table in one call / one transaction
+CREATE OR REPLACE FUNCTION add_text_columns(p_table_name TEXT, p_cols TEXT[])
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  col TEXT;
+BEGIN
+  FOREACH col IN ARRAY p_cols LOOP
+    EXECUTE format('ALTER TABLE %I ADD COLUMN IF NOT EXISTS %I TEXT', p_table_name, col);
+  END LOOP;
+END;
+$$;
+
+-- Runs as its owner, so only the import script's service role may call it
+REVOKE EXECUTE ON FUNCTION add_text_columns(TEXT, TEXT[]) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION add_text_columns(TEXT, TEXT[]) TO service_role;
+
+-- Adds TEXT columns across several tables in one call.
+-- p_columns maps table name -> array of column names: {"bronze_fs220": ["ACCT_010", ...]}
+CREATE OR REPLACE FUNCTION add_text_columns_bulk(p_columns JSONB)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  tbl TEXT;
+  cols JSONB;
+BEGIN
+  FOR tbl, cols IN SELECT key, value FROM jsonb_each(p_columns) LOOP
+    PERFORM add_text_columns(tbl, ARRAY(SELECT jsonb_array_elements_text(cols)));
+  END LOOP;
+END;
+$$;
+
+-- Runs as its owner, so only the import script's service role may call it
+REVOKE EXECUTE ON FUNCTION add_text_columns_bulk(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION add_text_columns_bulk(JSONB) TO service_role;
+
+
+-- ---------------------------------------------------------------------------
+-- Bulk upsert RPC used by the import script
+-- ---------------------------------------------------------------------------
+
+-- Upserts one batch of raw file rows into a bronze table with a single
+-- fixed-shape INSERT ... SELECT FROM unnest(...), one array per column.
+--
+-- p_data maps each file header to its column of raw values (equal-length
+-- arrays). p_cu_column / p_cycle_column name the headers holding the key
+-- fields; p_columns lists the data columns to write. Key fields are trimmed,
+-- empty strings become NULL, blank CU numbers are skipped, and a CU repeated
+-- within the batch keeps its last row.
+-- synchronous_commit is turned off for the rest of the calling request's
+-- transaction, as on the COPY path: the import is idempotent, so a crash
+-- losing the last commits is harmless. (No SET clause on the function, which
+-- would restore the setting before the commit.)
+-- Runs with the caller's rights and only touches bronze_* tables; EXECUTE is
+-- limited to the service role used by the import script.
+CREATE OR REPLACE FUNCTION bulk_upsert_bronze(
+  p_table_name TEXT,
+  p_year INT,
+  p_quarter INT,
+  p_period TEXT,
+  p_source_url TEXT,
+  p_cu_column TEXT,
+  p_cycle_column TEXT,
+  p_columns TEXT[],
+  p_data JSONB
+)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+  src TEXT[] := ARRAY[p_cu_column, coalesce(p_cycle_column, p_cu_column)] || p_columns;
+  arrays TEXT;
+  aliases TEXT;
+  data_cols TEXT;
+  data_select TEXT;
+  data_update TEXT;
+BEGIN
+  IF p_table_name NOT LIKE 'bronze\_%' THEN
+    RAISE EXCEPTION 'bulk_upsert_bronze: % is not a bronze table', p_table_name;
+  END IF;
+
+  PERFORM set_config('synchronous_commit', 'off', true);
+
+  SELECT string_agg(format(
+           'ARRAY(SELECT e FROM jsonb_array_elements_text($1 -> %L) WITH ORDINALITY AS t(e, i) ORDER BY i)',
+           s.name), ', ' ORDER BY s.ord),
+         string_agg(format('c%s', s.ord), ', ' ORDER BY s.ord)
+    INTO arrays, aliases
+  FROM unnest(src) WITH ORDINALITY AS s(name, ord);
+
+  SELECT coalesce(string_agg(format(', %I', c.name), '' ORDER BY c.ord), ''),
+         coalesce(string_agg(format(', NULLIF(c%s, '''')', c.ord + 2), '' ORDER BY c.ord), ''),
+         coalesce(string_agg(format(', %1$I = EXCLUDED.%1$I', c.name), '' ORDER BY c.ord), '')
+    INTO data_cols, data_select, data_update
+  FROM unnest(p_columns) WITH ORDINALITY AS c(name, ord);
+
+  EXECUTE format(
+    'INSERT INTO %I (cu_number, cycle_date, year, quarter, period, source_url%s) '
+    'SELECT DISTINCT ON (btrim(c1)) btrim(c1), %s, $2, $3, $4, $5%s '
+    'FROM unnest(%s) WITH ORDINALITY AS u(%s, row_ord) '
+    'WHERE btrim(c1) <> '''' '
+    'ORDER BY btrim(c1), row_ord DESC '
+    'ON CONFLICT (cu_number, year, quarter) DO UPDATE SET '
+    'cycle_date = EXCLUDED.cycle_date, period = EXCLUDED.period, '
+    'source_url = EXCLUDED.source_url%s',
+    p_table_name,
+    data_cols,
+    CASE WHEN p_cycle_column IS NULL THEN 'NULL' ELSE 'NULLIF(btrim(c2), '''')' END,
+    data_select,
+    arrays,
+    aliases,
+    data_update
+  ) USING p_data, p_year, p_quarter, p_period, p_source_url;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION bulk_upsert_bronze(TEXT, INT, INT, TEXT, TEXT, TEXT, TEXT, TEXT[], JSONB)
+  FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION bulk_upsert_bronze(TEXT, INT, INT, TEXT, TEXT, TEXT, TEXT, TEXT[], JSONB)
+  TO service_role;
@@ -12,6 +12,13 @@ adds any missing columns to the table via ALTER TABLE ADD COLUMN (TEXT).
 
 Tables: bronze_foicu, bronze_fs220, bronze_fs220a, ... bronze_fs220s
 
+Rows are upserted through the Supabase REST API by default, posted as
+one array per column to the bulk_upsert_bronze RPC (migration 015). If
+SUPABASE_DB_URL is set (direct Postgres connection string, requires
+psycopg), each file is instead streamed with COPY into a temp table and
+merged into the bronze table with a single INSERT ... ON CONFLICT. In that
+mode Postgres parses the CSV itself; Python only reads the header line.
+
 Usage:
     python import_bronze.py 2025-Q3              # Single quarter
     python import_bronze.py 2024-Q3 2025-Q3      # Range (inclusive)
@@ -20,19 +27,36 @@ Usage:
 
 import argparse
 import csv
+import io
+import itertools
+import json
 import os
 import re
 import shutil
 import sys
 import tempfile
-import time
+import threading
 import urllib.request
 import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import closing
 from pathlib import Path
+from typing import IO
 
+import httpx
 from dotenv import load_dotenv
 from supabase import create_client
 
+try:
+    import orjson  # optional: several times faster than json for wide batches
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # optional: lets httpx multiplex concurrent upserts over HTTP/2
+except ImportError:
+    h2 = None
+
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
@@ -40,6 +64,7 @@ from supabase import create_client
 NCUA_BASE_URL = "https://www.ncua.gov/files/publications/analysis"
 
 QUARTER_MONTH = {1: "03", 2: "06", 3: "09", 4: "12"}
+_QUARTER_RE = re.compile(r"^(\d{4})-Q([1-4])$")
 
 SOURCE_FILES = {
     "FOICU.txt": "bronze_foicu",
@@ -64,11 +89,19 @@ SOURCE_FILES = {
 
 ALLOWED_PROJECTS = ["jhlkpogfkytfedqupytv", "ckpihayqxwplgxdmijyp"]
 BATCH_SIZE = 200
+COPY_CHUNK_SIZE = 1024 * 1024
+MAX_WORKERS = 6
+UPLOAD_TIMEOUT = 120
+KEEPALIVE_CONNECTIONS = 16
+KEEPALIVE_EXPIRY = 300
 
 # Columns managed by the schema — not sourced from the file
 KEY_COLUMNS = {"id", "cu_number", "cycle_date", "year", "quarter", "period",
                "source_url", "imported_at"}
 
+# Unique key shared by every bronze table (upsert conflict target)
+CONFLICT_COLUMNS = {"cu_number", "year", "quarter"}
+
 # ---------------------------------------------------------------------------
 # Environment
 # ---------------------------------------------------------------------------
@@ -96,7 +129,47 @@ def load_env(env_file: str | None = None):
     if not any(ref in url for ref in ALLOWED_PROJECTS):
         sys.exit(f"IMPORT BLOCKED — target project not in allow list\nTarget: {url}")
 
-    return create_client(url, key), url
+    db_url = (os.getenv("SUPABASE_DB_URL") or "").strip().strip("'\"") or None
+    if db_url and not any(ref in db_url for ref in ALLOWED_PROJECTS):
+        sys.exit("IMPORT BLOCKED — SUPABASE_DB_URL project not in allow list")
+
+    return create_client(url, key), rest_session(url, key), url, db_url
+
+
+def rest_session(url: str, key: str) -> httpx.Client:
+    """HTTP client for posting upserts straight to PostgREST (thread-safe).
+
+    One client serves the whole run, so its keep-alive pool carries the
+    TLS connections across files and quarters.
+    """
+    return httpx.Client(
+        base_url=f"{url}/rest/v1",
+        headers={"apikey": key, "Authorization": f"Bearer {key}"},
+        timeout=UPLOAD_TIMEOUT,
+        limits=httpx.Limits(
+            max_keepalive_connections=KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        http2=h2 is not None,
+    )
+
+
+def connect_db(db_url: str):
+    try:
+        import psycopg
+    except ImportError:
+        sys.exit("ERROR: SUPABASE_DB_URL is set but psycopg is not installed "
+                 "(pip install 'psycopg[binary]')")
+    return psycopg.connect(db_url, autocommit=True)
+
+
+_print_lock = threading.Lock()
+
+
+def log(msg: str):
+    """print() that stays line-atomic when called from ingest workers."""
+    with _print_lock:
+        print(msg)
 
 
 # ---------------------------------------------------------------------------
@@ -105,7 +178,7 @@ def load_env(env_file: str | None = None):
 
 
 def parse_quarter(s: str) -> tuple[int, int]:
-    m = re.match(r"^(\d{4})-Q([1-4])$", s)
+    m = _QUARTER_RE.match(s)
     if not m:
         sys.exit(f'Invalid quarter format: "{s}". Expected YYYY-QN (e.g. 2025-Q3)')
     return int(m.group(1)), int(m.group(2))
@@ -130,61 +203,121 @@ def quarter_range(start: str, end: str) -> list[str]:
     return quarters
 
 
+def _quarter_available(year: int, quarter: int) -> bool:
+    try:
+        req = urllib.request.Request(quarter_url(year, quarter), method="HEAD")
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status == 200
+    except Exception:
+        return False
+
+
 def detect_latest() -> str:
     from datetime import datetime, timedelta
 
     probe = datetime.now() - timedelta(days=45)
     year, quarter = probe.year, (probe.month - 1) // 3 + 1
 
+    candidates = []
     for _ in range(4):
-        url = quarter_url(year, quarter)
-        try:
-            req = urllib.request.Request(url, method="HEAD")
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                if resp.status == 200:
-                    result = f"{year}-Q{quarter}"
-                    print(f"  Latest available quarter: {result}")
-                    return result
-        except Exception:
-            pass
+        candidates.append((year, quarter))
         quarter -= 1
         if quarter < 1:
             quarter, year = 4, year - 1
 
+    # Probe all candidates at once; results come back newest-first
+    with ThreadPoolExecutor(len(candidates)) as pool:
+        available = pool.map(lambda yq: _quarter_available(*yq), candidates)
+        for (year, quarter), ok in zip(candidates, available):
+            if ok:
+                result = f"{year}-Q{quarter}"
+                print(f"  Latest available quarter: {result}")
+                return result
+
     sys.exit("Could not detect latest available quarter from NCUA")
 
 
 # ---------------------------------------------------------------------------
-# Download & extract
+# Download
 # ---------------------------------------------------------------------------
 
 
-def download_and_extract(year: int, quarter: int) -> tuple[str, str, str]:
+def download_zip(year: int, quarter: int) -> tuple[IO[bytes], str]:
+    """Download the quarter's ZIP into an anonymous temp file."""
     url = quarter_url(year, quarter)
-    tmp = tempfile.mkdtemp(prefix=f"ncua-bronze-{year}-Q{quarter}-")
+    spool = tempfile.TemporaryFile()
+
+    log(f"  Downloading {url}...")
+    with urllib.request.urlopen(url) as resp:
+        shutil.copyfileobj(resp, spool, COPY_CHUNK_SIZE)
+    log(f"  Downloaded ZIP ({spool.tell() / 1024 / 1024:.1f} MB)")
+
+    spool.seek(0)
+    return spool, url
+
+
+def _download_in_background(quarter_str: str) -> Future:
+    """Run download_zip on a daemon thread, so an aborted run never waits on it."""
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(download_zip(*parse_quarter(quarter_str)))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
 
-    print(f"  Downloading {url}...")
-    zip_path = os.path.join(tmp, "data.zip")
-    urllib.request.urlretrieve(url, zip_path)
 
-    extract_dir = os.path.join(tmp, "data")
-    with zipfile.ZipFile(zip_path) as zf:
-        size_mb = os.path.getsize(zip_path) / 1024 / 1024
-        print(f"  Extracting ZIP ({size_mb:.1f} MB)...")
-        zf.extractall(extract_dir)
-    os.remove(zip_path)
+def _close_download(future: Future):
+    if not future.cancelled() and future.exception() is None:
+        future.result()[0].close()
 
-    data_dir = resolve_data_dir(extract_dir)
-    return tmp, data_dir, url
 
+def prefetch_zips(quarters: list[str]):
+    """Yield (quarter_str, spool, url) for each quarter in order.
 
-def resolve_data_dir(extract_dir: str) -> str:
-    if os.path.exists(os.path.join(extract_dir, "FOICU.txt")):
-        return extract_dir
-    for entry in os.scandir(extract_dir):
-        if entry.is_dir() and os.path.exists(os.path.join(entry.path, "FOICU.txt")):
-            return entry.path
-    sys.exit(f"FOICU.txt not found in extracted data at {extract_dir}")
+    The next quarter's ZIP downloads in the background while the caller
+    imports the current one, so only the first download is waited on.
+    Close the generator when abandoning it early so that download's temp
+    file is released.
+    """
+    pending = _download_in_background(quarters[0])
+    try:
+        for i, quarter_str in enumerate(quarters):
+            spool, url = pending.result()
+            pending = None
+            if i + 1 < len(quarters):
+                pending = _download_in_background(quarters[i + 1])
+            yield quarter_str, spool, url
+    finally:
+        # Don't wait for a download nobody will import; close it when it lands
+        if pending is not None:
+            pending.add_done_callback(_close_download)
+
+
+def resolve_members(zf: zipfile.ZipFile) -> dict[str, str]:
+    """Map source file names to ZIP members (the files may sit in a subfolder)."""
+    names = zf.namelist()
+    foicu = next((n for n in names if n.rsplit("/", 1)[-1] == "FOICU.txt"), None)
+    if foicu is None:
+        sys.exit("FOICU.txt not found in downloaded ZIP")
+
+    prefix = foicu[: -len("FOICU.txt")]
+    available = set(names)
+    return {
+        filename: prefix + filename
+        for filename in SOURCE_FILES
+        if prefix + filename in available
+    }
+
+
+def open_member(zf: zipfile.ZipFile, member: str) -> io.TextIOWrapper:
+    """Open a ZIP member as text for csv (newline="" as csv requires)."""
+    return io.TextIOWrapper(zf.open(member), encoding="utf-8", errors="replace", newline="")
 
 
 # ---------------------------------------------------------------------------
@@ -192,28 +325,46 @@ def resolve_data_dir(extract_dir: str) -> str:
 # ---------------------------------------------------------------------------
 
 
-def ensure_columns(supabase, table_name: str, file_headers: list[str]):
-    """Add any columns from the file that don't yet exist in the table."""
+# Known columns per table, kept for the whole run. Only this script adds
+# columns, so the cache stays accurate once a table has been queried.
+_column_cache: dict[str, set[str]] = {}
+
+
+def get_columns(supabase, table_name: str) -> set[str]:
+    existing = _column_cache.get(table_name)
+    if existing is None:
+        resp = supabase.rpc("get_column_names", {"p_table_name": table_name}).execute()
+        existing = _column_cache[table_name] = set(resp.data) if resp.data else set()
+    return existing
 
-    # Get current columns from the table
-    resp = supabase.rpc("get_column_names", {"p_table_name": table_name}).execute()
-    existing = set(resp.data) if resp.data else set()
 
-    new_cols = [h for h in file_headers if h not in existing and h not in KEY_COLUMNS]
+def read_headers(zf: zipfile.ZipFile, member: str) -> list[str]:
+    """Read just the header line of a ZIP member."""
+    with open_member(zf, member) as f:
+        return next(csv.reader(f), [])
 
-    if not new_cols:
+
+def ensure_columns_bulk(supabase, headers_by_table: dict[str, list[str]]):
+    """Add every missing file column across all tables, then reload once."""
+
+    new_by_table = {}
+    for table_name, file_headers in headers_by_table.items():
+        existing = get_columns(supabase, table_name)
+        new_cols = [h for h in file_headers if h not in existing and h not in KEY_COLUMNS]
+        if new_cols:
+            log(f"    Adding {len(new_cols)} new column(s) to {table_name}...")
+            new_by_table[table_name] = new_cols
+
+    if not new_by_table:
         return
 
-    print(f"    Adding {len(new_cols)} new column(s) to {table_name}...")
-    for col in new_cols:
-        supabase.rpc("add_text_column", {
-            "p_table_name": table_name,
-            "p_column_name": col,
-        }).execute()
+    supabase.rpc("add_text_columns_bulk", {"p_columns": new_by_table}).execute()
+    for table_name, new_cols in new_by_table.items():
+        _column_cache[table_name].update(new_cols)
 
-    # Tell PostgREST to reload its schema cache so it sees the new columns
+    # Let other PostgREST consumers see the new columns. The import itself
+    # writes through SQL (bulk_upsert_bronze or COPY), so it doesn't wait
     supabase.rpc("reload_schema_cache", {}).execute()
-    time.sleep(1)
 
 
 # ---------------------------------------------------------------------------
@@ -221,59 +372,233 @@ def ensure_columns(supabase, table_name: str, file_headers: list[str]):
 # ---------------------------------------------------------------------------
 
 
-def ingest_file(
-    supabase, file_path: str, table_name: str, year: int, quarter: int,
+def _column_index(headers: list[str], name: str) -> int | None:
+    """Case-insensitive position of a header (NCUA mixes CU_NUMBER / CU_Number)."""
+    for i, h in enumerate(headers):
+        if h.lower() == name:
+            return i
+    return None
+
+
+def _read_records(f):
+    """Parse CSV lines, using str.split while the file stays quote-free.
+
+    NCUA data is almost entirely unquoted numbers, so splitting avoids the
+    csv module's per-character state machine. The first line containing a
+    quote is handed, with the rest of the file, to csv.reader so quoted
+    commas and embedded newlines still parse correctly.
+    """
+    for line in f:
+        if '"' in line:
+            yield from csv.reader(itertools.chain((line,), f))
+            return
+        yield line.rstrip("\r\n").split(",")
+
+
+def _iter_records(reader, width: int, cu_idx: int):
+    """Yield every data row that carries a CU number, padded to `width`."""
+    for record in reader:
+        if len(record) < width:
+            record += [""] * (width - len(record))
+
+        # strip() only decides whether the row counts; trimming happens in SQL
+        if record[cu_idx].strip():
+            yield record
+
+
+def _dumps(payload: dict) -> bytes:
+    """Compact UTF-8 JSON, via orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _post_batch(
+    http: httpx.Client, args: dict, fields: list[tuple[str, int]],
+    batch: list[list[str]],
+) -> int:
+    """Upsert one batch via the bulk_upsert_bronze RPC. Returns 1 on error, else 0.
+
+    The raw records are transposed into one array per column, so each header
+    name is sent once per batch instead of once per row.
+    """
+    columns = list(zip(*batch))
+    body = _dumps({**args, "p_data": {h: columns[i] for h, i in fields}})
+
+    try:
+        resp = http.post(
+            "/rpc/bulk_upsert_bronze", content=body,
+            headers={"Content-Type": "application/json"},
+        )
+    except httpx.HTTPError as e:
+        log(f"    ERROR upserting {args['p_table_name']}: {e}")
+        return 1
+    if resp.is_error:
+        log(f"    ERROR upserting {args['p_table_name']}: {resp.status_code} {resp.text}")
+        return 1
+    return 0
+
+
+class BatchUploader:
+    """Posts upsert batches from a thread pool so parsing overlaps uploads.
+
+    One uploader is shared by all ingest workers of a quarter. Each file keeps
+    at most one batch in flight (see ingest_file), so at most MAX_WORKERS
+    batches are pending at once.
+    """
+
+    def __init__(self, http: httpx.Client):
+        self.http = http
+        self._pool = ThreadPoolExecutor(MAX_WORKERS)
+
+    def submit(
+        self, args: dict, fields: list[tuple[str, int]], batch: list[list[str]],
+    ) -> Future:
+        return self._pool.submit(_post_batch, self.http, args, fields, batch)
+
+    def close(self):
+        self._pool.shutdown()
+
+
+def _copy_file(
+    conn, f, table_name: str, headers: list[str], data_headers: list[str],
+    cu_header: str, cycle_header: str | None, year: int, quarter: int,
     period: str, source_url: str,
+) -> int:
+    """Stream the raw file body through COPY CSV, then merge with one upsert.
+
+    Postgres parses the CSV natively into a TEXT staging table shaped like the
+    file; the key columns and empty-to-NULL mapping are applied in the merge.
+    The staging table is a temp table (never WAL-logged) dropped at commit.
+    Returns the number of staged rows with a CU number, matching the REST
+    path's count of parsed records.
+    """
+    from psycopg import sql
+
+    staging = sql.Identifier(f"staging_{table_name}")
+    file_cols = sql.SQL(", ").join(map(sql.Identifier, headers))
+    target = sql.Identifier(table_name)
+    columns = ["cu_number", "cycle_date", "year", "quarter", "period",
+               "source_url"] + data_headers
+    cu = sql.SQL("btrim({})").format(sql.Identifier(cu_header))
+    select = [
+        cu,
+        sql.SQL("NULLIF(btrim({}), '')").format(sql.Identifier(cycle_header))
+        if cycle_header else sql.NULL,
+        sql.Literal(year),
+        sql.Literal(quarter),
+        sql.Literal(period),
+        sql.Literal(source_url),
+    ] + [sql.SQL("NULLIF({}, '')").format(sql.Identifier(h)) for h in data_headers]
+    updates = sql.SQL(", ").join(
+        sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(c))
+        for c in columns if c not in CONFLICT_COLUMNS
+    )
+
+    with conn.transaction(), conn.cursor() as cur:
+        # The import is idempotent and re-runnable, so a crash losing the last
+        # commit is harmless; skip waiting on the WAL flush
+        cur.execute("SET LOCAL synchronous_commit = off")
+        cur.execute(sql.SQL(
+            "CREATE TEMP TABLE {} (_staging_row BIGINT GENERATED ALWAYS AS IDENTITY, {}) "
+            "ON COMMIT DROP"
+        ).format(
+            staging,
+            sql.SQL(", ").join(sql.SQL("{} TEXT").format(sql.Identifier(h)) for h in headers),
+        ))
+
+        with cur.copy(sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+            staging, file_cols,
+        )) as copy:
+            while chunk := f.read(COPY_CHUNK_SIZE):
+                copy.write(chunk)
+
+        cur.execute(sql.SQL("SELECT count(*) FROM {} WHERE {} <> ''").format(staging, cu))
+        total = cur.fetchone()[0]
+
+        # One statement can't upsert the same key twice, so keep the last
+        # occurrence of a CU in the file, as the REST path does
+        cur.execute(sql.SQL(
+            "INSERT INTO {target} ({cols}) "
+            "SELECT DISTINCT ON ({cu}) {select} FROM {staging} "
+            "WHERE {cu} <> '' ORDER BY {cu}, _staging_row DESC "
+            "ON CONFLICT (cu_number, year, quarter) DO UPDATE SET {updates}"
+        ).format(
+            target=target,
+            cols=sql.SQL(", ").join(map(sql.Identifier, columns)),
+            select=sql.SQL(", ").join(select),
+            staging=staging,
+            cu=cu,
+            updates=updates,
+        ))
+        return total
+
+
+def ingest_file(
+    uploader: BatchUploader, f, filename: str, table_name: str,
+    year: int, quarter: int, period: str, source_url: str, conn=None,
 ):
-    if not os.path.exists(file_path):
-        print(f"    {os.path.basename(file_path)}: not found, skipping")
+    reader = _read_records(f)
+    headers = next(reader, [])
+
+    # Resolve column positions once so the row loop indexes lists directly
+    width = len(headers)
+    data_headers = [h for h in headers if h not in KEY_COLUMNS]
+    cu_idx = _column_index(headers, "cu_number")
+    cycle_idx = _column_index(headers, "cycle_date")
+    if cu_idx is None:
+        log(f"    {filename}: no CU_NUMBER column, skipping")
         return 0
 
-    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-        reader = csv.DictReader(f)
-        headers = reader.fieldnames or []
-
-        # Ensure all file columns exist in the table
-        ensure_columns(supabase, table_name, headers)
-
-        rows = []
-        for record in reader:
-            cu_number = (record.get("CU_NUMBER") or record.get("CU_Number") or "").strip()
-            if not cu_number:
-                continue
-
-            row = {
-                "cu_number": cu_number,
-                "cycle_date": (record.get("CYCLE_DATE") or record.get("Cycle_Date") or "").strip() or None,
-                "year": year,
-                "quarter": quarter,
-                "period": period,
-                "source_url": source_url,
-            }
-
-            # Spread every file column into the row as-is
-            for header in headers:
-                if header not in KEY_COLUMNS:
-                    value = record.get(header, "")
-                    row[header] = value if value != "" else None
-
-            rows.append(row)
-
-    # Batch upsert
     errors = 0
-    for i in range(0, len(rows), BATCH_SIZE):
-        batch = rows[i : i + BATCH_SIZE]
-        resp = supabase.table(table_name).upsert(
-            batch, on_conflict="cu_number,year,quarter"
-        ).execute()
-        if hasattr(resp, "error") and resp.error:
-            print(f"    ERROR upserting {table_name}: {resp.error}")
-            errors += 1
-
-    fname = os.path.basename(file_path)
-    print(f"    {fname} -> {table_name}: {len(rows)} rows ({len(headers)} columns)"
+    if conn is not None:
+        import psycopg
+
+        # COPY rejects the whole file on a single malformed row; report it like
+        # a failed batch instead of aborting the run
+        try:
+            total = _copy_file(
+                conn, f, table_name, headers, data_headers,
+                headers[cu_idx], headers[cycle_idx] if cycle_idx is not None else None,
+                year, quarter, period, source_url,
+            )
+        except psycopg.Error as e:
+            log(f"    ERROR copying {filename} into {table_name}: {e}")
+            total, errors = 0, 1
+    else:
+        # Records ship as raw column arrays; bulk_upsert_bronze applies the
+        # same trimming and empty-to-NULL mapping as the COPY merge
+        args = {
+            "p_table_name": table_name,
+            "p_year": year,
+            "p_quarter": quarter,
+            "p_period": period,
+            "p_source_url": source_url,
+            "p_cu_column": headers[cu_idx],
+            "p_cycle_column": headers[cycle_idx] if cycle_idx is not None else None,
+            "p_columns": data_headers,
+        }
+        fields = [(h, i) for i, h in enumerate(headers)
+                  if i in (cu_idx, cycle_idx) or h not in KEY_COLUMNS]
+
+        # Keep one batch of this file in flight: the next one is parsed while
+        # it uploads, and a CU repeated across batches still ends up with its
+        # last row. Other files upload concurrently.
+        records = _iter_records(reader, width, cu_idx)
+        pending = None
+        total = 0
+        while True:
+            batch = list(itertools.islice(records, BATCH_SIZE))
+            if pending is not None:
+                errors += pending.result()
+            if not batch:
+                break
+            total += len(batch)
+            pending = uploader.submit(args, fields, batch)
+
+    log(f"    {filename} -> {table_name}: {total} rows ({len(headers)} columns)"
           f"{f' ({errors} batch errors)' if errors else ''}")
-    return len(rows)
+    return total
 
 
 # ---------------------------------------------------------------------------
@@ -281,27 +606,67 @@ def ingest_file(
 # ---------------------------------------------------------------------------
 
 
-def import_quarter(supabase, quarter_str: str):
+def _ingest_member(
+    uploader: BatchUploader, zf: zipfile.ZipFile, member: str, filename: str,
+    table_name: str, year: int, quarter: int, period: str, source_url: str,
+    db_url: str | None,
+) -> int:
+    """Worker: ingest one ZIP member, with its own DB connection on the COPY path."""
+    conn = connect_db(db_url) if db_url else None
+    try:
+        with open_member(zf, member) as f:
+            return ingest_file(
+                uploader, f, filename, table_name, year, quarter, period,
+                source_url, conn,
+            )
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def import_quarter(
+    supabase, http: httpx.Client, quarter_str: str, spool, source_url: str,
+    db_url: str | None = None,
+):
     year, quarter = parse_quarter(quarter_str)
     period = quarter_str
 
-    print(f"\n{'=' * 50}")
-    print(f"  Bronze Import: {quarter_str}")
-    print(f"{'=' * 50}\n")
+    log(f"\n{'=' * 50}")
+    log(f"  Bronze Import: {quarter_str}")
+    log(f"{'=' * 50}\n")
 
-    tmp, data_dir, source_url = download_and_extract(year, quarter)
     total_rows = 0
 
+    uploader = BatchUploader(http)
+
     try:
-        for filename, table_name in SOURCE_FILES.items():
-            file_path = os.path.join(data_dir, filename)
-            total_rows += ingest_file(
-                supabase, file_path, table_name, year, quarter, period, source_url
-            )
+        # Files map to disjoint tables, so they can be ingested independently
+        with spool, zipfile.ZipFile(spool) as zf, ThreadPoolExecutor(MAX_WORKERS) as pool:
+            members = resolve_members(zf)
+            for filename in SOURCE_FILES:
+                if filename not in members:
+                    log(f"    {filename}: not found, skipping")
+
+            # Reconcile every table's schema up front so DDL and the schema
+            # cache reload stay out of the ingest workers
+            ensure_columns_bulk(supabase, {
+                SOURCE_FILES[filename]: read_headers(zf, member)
+                for filename, member in members.items()
+            })
+
+            futures = [
+                pool.submit(
+                    _ingest_member, uploader, zf, member, filename,
+                    SOURCE_FILES[filename], year, quarter, period, source_url, db_url,
+                )
+                for filename, member in members.items()
+            ]
+            for future in as_completed(futures):
+                total_rows += future.result()
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        uploader.close()
 
-    print(f"\n  Complete: {total_rows} total rows imported for {quarter_str}")
+    log(f"\n  Complete: {total_rows} total rows imported for {quarter_str}")
     return total_rows
 
 
@@ -317,9 +682,9 @@ def main():
     parser.add_argument("--env", type=str, help="Custom env file (e.g. .env.medallion)")
     args = parser.parse_args()
 
-    supabase, url = load_env(args.env)
+    supabase, http, url, db_url = load_env(args.env)
     print(f"Bronze Layer NCUA Import")
-    print(f"Target: {url}\n")
+    print(f"Target: {url}{' (COPY via SUPABASE_DB_URL)' if db_url else ''}\n")
 
     if args.latest:
         quarters = [detect_latest()]
@@ -334,8 +699,9 @@ def main():
     print(f"Quarters to import: {', '.join(quarters)}")
 
     total = 0
-    for q in quarters:
-        total += import_quarter(supabase, q)
+    with http, closing(prefetch_zips(quarters)) as downloads:
+        for q, spool, source_url in downloads:
+            total += import_quarter(supabase, http, q, spool, source_url, db_url)
 
     print(f"\n{'=' * 50}")
     print(f"  All done! {len(quarters)} quarter(s), {total} total rows")